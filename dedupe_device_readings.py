@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+One-time cleanup before the unique index on device readings can be built
+
+Databases written before the index existed may hold the same Apple Watch
+reading (user and timestamp) more than once. This keeps the newest copy of
+each, drops the rest, and then creates the index. Run it once by hand,
+while the app is stopped; it is safe to run again.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.models.health_data import db, DEVICE_DATA_SOURCE, HealthData
+from src.main import app
+from sqlalchemy import delete, func, select
+
+def dedupe_device_readings():
+    """Keep only the newest device reading per user and timestamp"""
+    
+    with app.app_context():
+        is_device_reading = HealthData.data_source == DEVICE_DATA_SOURCE
+        newest = select(func.max(HealthData.id)).where(is_device_reading).group_by(
+            HealthData.user_id, HealthData.timestamp
+        )
+        result = db.session.execute(delete(HealthData).where(is_device_reading, HealthData.id.not_in(newest)))
+        db.session.commit()
+        print(f"Deleted {result.rowcount} duplicate Apple Watch readings")
+        
+        for index in HealthData.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+        print("Health data indexes are in place")
+
+if __name__ == '__main__':
+    dedupe_device_readings()
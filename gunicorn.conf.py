@@ -0,0 +1,39 @@
+"""
+Gunicorn settings, picked up automatically when gunicorn is started from
+the project root (Procfile, render.yaml and the Replit deployment all do).
+"""
+
+import multiprocessing
+import os
+
+# Every endpoint spends most of its time waiting on the database, so each
+# worker serves several requests at once instead of one at a time. Threads
+# are the default; set GUNICORN_WORKER_CLASS=gevent to serve requests on
+# greenlets instead (gunicorn monkey-patches the worker for us)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 4)))
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+
+if worker_class == 'gevent':
+    worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+    # Log a warning whenever a greenlet blocks the event loop, e.g. on
+    # CPU-bound work or a driver call that isn't cooperative
+    os.environ.setdefault('GEVENT_MONITOR_THREAD_ENABLE', '1')
+    # The app is preloaded in the master, so patch before it is imported
+    # rather than in each worker after the fork
+    from gevent import monkey
+    monkey.patch_all()
+
+# Import the app once in the master so its startup DDL (create_all and the
+# index pass) runs once, instead of racing in every worker
+preload_app = True
+
+def post_fork(server, worker):
+    """Give each worker its own connection pool instead of the master's"""
+    from src.main import app
+    from src.models.user import db
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+# Keep idle client connections open briefly so polling clients reuse them
+keepalive = 5
@@ -6,58 +6,76 @@ Populate Apple Watch data for the past 14 days
 import sys
 sys.path.insert(0, '/home/ubuntu/family-care-api')
 
-from src.models.health_data import db, HealthData
+from src.models.health_data import db, dialect_insert, DEVICE_DATA_SOURCE, IS_DEVICE_READING, HealthData
 from src.main import app
+from sqlalchemy import delete
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-import random
+import numpy as np
+
+# Resolve the zone once rather than on every call
+EASTERN = ZoneInfo('America/New_York')
 
 def generate_apple_watch_data():
     """Generate realistic Apple Watch data for the past 14 days"""
     
     with app.app_context():
-        # Delete existing Apple Watch data for user_id=2
-        HealthData.query.filter_by(user_id=2, data_source='apple_watch').delete()
-        db.session.commit()
-        
         print("Generating Apple Watch data for the past 14 days...")
         
         # Generate data for the past 14 days using Eastern timezone
-        eastern = ZoneInfo('America/New_York')
-        today = datetime.now(eastern).replace(hour=12, minute=0, second=0, microsecond=0)
-        
-        entries_created = 0
-        
-        for days_ago in range(13, -1, -1):  # 13 days ago to today (14 days total)
-            date = today - timedelta(days=days_ago)
-            
-            # Generate realistic heart rate (60-75 bpm range for resting)
-            heart_rate = random.randint(60, 75)
-            
-            # Generate realistic daily steps (4000-8500 range)
-            steps = random.randint(4000, 8500)
-            
-            # Create entry
-            entry = HealthData(
-                user_id=2,
-                timestamp=date,
-                heart_rate=heart_rate,
-                steps=steps,
-                activity_level=random.randint(20, 60),
-                data_source='apple_watch',
-                is_manual_entry=False
-            )
-            
-            db.session.add(entry)
-            entries_created += 1
-            
-            print(f"  {date.date()}: HR={heart_rate} bpm, Steps={steps}")
+        today = datetime.now(EASTERN).replace(hour=12, minute=0, second=0, microsecond=0)
+        
+        days_ago = range(13, -1, -1)  # 13 days ago to today (14 days total)
+        
+        # Draw every day's values at once: realistic resting heart rate
+        # (60-75 bpm), daily steps (4000-8500) and activity level (20-60)
+        rng = np.random.default_rng()
+        heart_rates = rng.integers(60, 76, size=len(days_ago)).tolist()
+        steps = rng.integers(4000, 8501, size=len(days_ago)).tolist()
+        activity_levels = rng.integers(20, 61, size=len(days_ago)).tolist()
         
+        # Build plain row mappings and upsert them in one statement, so a
+        # re-run refreshes existing days instead of deleting and re-inserting
+        rows = [
+            {
+                'user_id': 2,
+                'timestamp': today - timedelta(days=days),
+                'heart_rate': heart_rates[i],
+                'steps': steps[i],
+                'activity_level': activity_levels[i],
+                'data_source': DEVICE_DATA_SOURCE,
+                'is_manual_entry': False
+            }
+            for i, days in enumerate(days_ago)
+        ]
+        
+        # Drop days that have fallen out of the window, in the same
+        # transaction as the upsert
+        db.session.execute(delete(HealthData).where(
+            HealthData.user_id == 2,
+            HealthData.data_source == DEVICE_DATA_SOURCE,
+            HealthData.timestamp < today - timedelta(days=13)
+        ))
+        
+        stmt = dialect_insert(HealthData).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'timestamp'],
+            index_where=IS_DEVICE_READING,
+            set_={
+                'heart_rate': stmt.excluded.heart_rate,
+                'steps': stmt.excluded.steps,
+                'activity_level': stmt.excluded.activity_level,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+        db.session.execute(stmt)
         db.session.commit()
         
-        print(f"\n✅ Successfully created {entries_created} Apple Watch data entries")
+        for row in rows:
+            print(f"  {row['timestamp'].date()}: HR={row['heart_rate']} bpm, Steps={row['steps']}")
+        
+        print(f"\n✅ Successfully saved {len(rows)} Apple Watch data entries")
         print(f"Date range: {(today - timedelta(days=13)).date()} to {today.date()}")
 
 if __name__ == '__main__':
-    generate_apple_watch_data()
-
+    generate_apple_watch_data()
\ No newline at end of file
@@ -6,127 +6,355 @@ Processes CSV exports from Apple Health/Watch data
 
 import csv
 import json
-from datetime import datetime
+from array import array
+from datetime import date, datetime
+from math import nan as NAN
 from typing import Dict, List, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow is optional, fall back to pandas
+    pa = None
+
+try:
+    import pandas as pd
+except ImportError:  # pandas is optional, fall back to the csv module
+    pd = None
+
+# Records sent per request to the bulk upload endpoint
+BULK_UPLOAD_PAGE_SIZE = 500
+
+# Apple Health export columns and the record fields they map to
+CSV_COLUMNS = {
+    'Distance walking / running(mi)': 'distance_miles',
+    'Heart rate(count/min)': 'heart_rate',
+    'Resting heart rate(count/min)': 'resting_heart_rate',
+    'Step count(count)': 'step_count'
+}
+METRIC_FIELDS = list(CSV_COLUMNS.values())
+
+# Timestamp format used by the export's Date column
+CSV_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Rows aggregated per block when streaming an export
+CSV_CHUNK_SIZE = 2 ** 18
+
+# Bytes handed to each of Arrow's parallel CSV parsing threads
+ARROW_BLOCK_SIZE = 8 << 20
+
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Metric cells the Arrow reader accepts as numbers, anything else is missing
+NUMBER_PATTERN = r'^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$'
 
 class AppleHealthParser:
     def __init__(self, api_base_url: str = "http://localhost:5000"):
         self.api_base_url = api_base_url
-        self.parsed_data = []
+        self._daily_totals = {}
+        
+        # Reuse keep-alive connections across uploads
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        
+    def parse_csv_file(self, csv_file_path: str) -> int:
+        """Parse Apple Health CSV export file into running daily totals
+        
+        Streams the export in blocks with pyarrow when it is installed,
+        otherwise with pandas or the csv module, so memory use is bounded by
+        the block size and the number of days. Exports Arrow can't read the
+        way the other readers do, such as an empty one or one with ragged
+        rows, go to them instead. Returns the number of records kept.
+        """
+        self._daily_totals = {}
+        
+        if pa is not None:
+            try:
+                return self._parse_with_arrow(csv_file_path)
+            except pa.ArrowInvalid:
+                # Arrow can only skip a short row, where the other readers
+                # keep the cells it does have
+                self._daily_totals = {}
+        if pd is not None:
+            return self._parse_with_pandas(csv_file_path)
+        return self._parse_csv_rows(csv_file_path)
+    
+    def _parse_with_arrow(self, csv_file_path: str) -> int:
+        """Stream the export through Arrow's CSV reader one record batch at a time"""
+        record_count = 0
+        # Metrics are read as text so a malformed cell becomes a missing
+        # value, as in _safe_float, rather than failing the whole import
+        reader = pacsv.open_csv(
+            csv_file_path,
+            read_options=pacsv.ReadOptions(block_size=ARROW_BLOCK_SIZE),
+            convert_options=pacsv.ConvertOptions(
+                column_types={column: pa.string() for column in ['Date'] + list(CSV_COLUMNS)},
+                include_columns=['Date'] + list(CSV_COLUMNS),
+                include_missing_columns=True,
+                strings_can_be_null=True,
+                null_values=['', 'NA', 'N/A']
+            )
+        )
+        
+        for batch in reader:
+            timestamps = pc.strptime(batch.column('Date'), format=CSV_DATE_FORMAT, unit='s', error_is_null=True)
+            metrics = [self._arrow_to_float(batch.column(column)) for column in CSV_COLUMNS]
+            
+            # Drop unparseable timestamps and records without any valid metric
+            has_metric = pc.is_valid(metrics[0])
+            for column in metrics[1:]:
+                has_metric = pc.or_(has_metric, pc.is_valid(column))
+            keep = pc.and_(pc.is_valid(timestamps), has_metric)
+            
+            timestamps = timestamps.filter(keep)
+            metrics = [column.filter(keep) for column in metrics]
+            step_index = METRIC_FIELDS.index('step_count')
+            metrics[step_index] = pc.trunc(metrics[step_index])  # Handle cases like "1234.0"
+            
+            # Nulls come back from Arrow as NaN in the float64 arrays
+            self._accumulate_block(
+                timestamps.to_numpy(zero_copy_only=False).astype('datetime64[D]'),
+                *(column.to_numpy(zero_copy_only=False) for column in metrics)
+            )
+            record_count += len(timestamps)
         
-    def parse_csv_file(self, csv_file_path: str) -> List[Dict]:
-        """Parse Apple Health CSV export file"""
-        parsed_records = []
+        return record_count
+    
+    @staticmethod
+    def _arrow_to_float(column: 'pa.Array') -> 'pa.Array':
+        """Cast a text column to float64, with null for anything that isn't a number"""
+        column = pc.utf8_trim_whitespace(column)
+        is_number = pc.match_substring_regex(column, NUMBER_PATTERN)
+        return pc.cast(pc.if_else(is_number, column, pa.scalar(None, pa.string())), pa.float64())
+    
+    def _parse_with_pandas(self, csv_file_path: str) -> int:
+        """Stream the export through pandas in CSV_CHUNK_SIZE row chunks"""
+        record_count = 0
+        try:
+            chunks = pd.read_csv(
+                csv_file_path,
+                usecols=lambda column: column == 'Date' or column in CSV_COLUMNS,
+                dtype=str,
+                chunksize=CSV_CHUNK_SIZE
+            )
+        except pd.errors.EmptyDataError:
+            # An empty export has no records, as with csv.DictReader
+            return 0
+        
+        for chunk in chunks:
+            chunk = chunk.rename(columns=CSV_COLUMNS).reindex(columns=['Date'] + METRIC_FIELDS)
+            
+            chunk['timestamp'] = pd.to_datetime(chunk.pop('Date'), format=CSV_DATE_FORMAT, errors='coerce')
+            # Malformed cells become NaN, as in _safe_float, instead of
+            # failing the whole import; columns missing from the export too
+            chunk[METRIC_FIELDS] = chunk[METRIC_FIELDS].apply(pd.to_numeric, errors='coerce').astype(np.float64)
+            # Handle cases like "1234.0"; "inf" is no step count, as in _safe_int
+            chunk['step_count'] = np.trunc(chunk['step_count'].where(np.isfinite(chunk['step_count'])))
+            
+            # Drop unparseable timestamps and records without any valid metric
+            chunk = chunk.dropna(subset=['timestamp']).dropna(subset=METRIC_FIELDS, how='all')
+            
+            # The frame is already columnar, hand its columns straight to the reducer
+            self._accumulate_block(
+                chunk['timestamp'].to_numpy().astype('datetime64[D]'),
+                *(chunk[field].to_numpy(dtype=np.float64) for field in METRIC_FIELDS)
+            )
+            record_count += len(chunk)
+        
+        return record_count
+    
+    def _parse_csv_rows(self, csv_file_path: str) -> int:
+        """Parse the export with the csv module into typed column buffers"""
+        record_count = 0
+        days, metrics = self._new_column_buffers()
         
         with open(csv_file_path, 'r', encoding='utf-8') as file:
             csv_reader = csv.DictReader(file)
             
             for row in csv_reader:
-                # Parse the timestamp
+                # Parse the timestamp; fromisoformat is much cheaper than
+                # strptime, but also accepts ISO variants CSV_DATE_FORMAT
+                # rejects, so only hand it the export's exact layout
+                date_str = row['Date']
+                if not date_str or len(date_str) != 19 or date_str[10] != ' ':
+                    continue
                 try:
-                    timestamp = datetime.strptime(row['Date'], '%Y-%m-%d %H:%M:%S')
+                    timestamp = datetime.fromisoformat(date_str)
                 except ValueError:
                     continue
                 
-                # Extract health metrics
-                record = {
-                    'timestamp': timestamp.isoformat(),
-                    'date': timestamp.date().isoformat(),
-                    'time': timestamp.time().isoformat(),
-                    'distance_miles': self._safe_float(row.get('Distance walking / running(mi)')),
-                    'heart_rate': self._safe_float(row.get('Heart rate(count/min)')),
-                    'resting_heart_rate': self._safe_float(row.get('Resting heart rate(count/min)')),
-                    'step_count': self._safe_int(row.get('Step count(count)'))
-                }
+                # Extract health metrics, in METRIC_FIELDS order
+                values = (
+                    self._safe_float(row.get('Distance walking / running(mi)')),
+                    self._safe_float(row.get('Heart rate(count/min)')),
+                    self._safe_float(row.get('Resting heart rate(count/min)')),
+                    self._safe_int(row.get('Step count(count)'))
+                )
                 
                 # Only include records with at least one valid metric
-                if any(record[key] is not None for key in ['heart_rate', 'resting_heart_rate', 'step_count', 'distance_miles']):
-                    parsed_records.append(record)
+                if all(value is None for value in values):
+                    continue
+                
+                days.append(timestamp.toordinal())
+                for column, value in zip(metrics, values):
+                    column.append(NAN if value is None else value)
+                record_count += 1
+                
+                if len(days) == CSV_CHUNK_SIZE:
+                    self._accumulate_column_buffers(days, metrics)
+                    days, metrics = self._new_column_buffers()
+        
+        self._accumulate_column_buffers(days, metrics)
+        return record_count
+    
+    def _new_column_buffers(self) -> Tuple[array, List[array]]:
+        """Typed buffers for one block of records: day ordinals and one column per metric"""
+        return array('q'), [array('d') for _ in METRIC_FIELDS]
+    
+    def _accumulate_column_buffers(self, days: array, metrics: List[array]) -> None:
+        """Fold buffered csv columns into the running daily totals"""
+        self._accumulate_block(
+            (np.frombuffer(days, dtype=np.int64) - UNIX_EPOCH_ORDINAL).astype('datetime64[D]'),
+            *(np.frombuffer(column, dtype=np.float64) for column in metrics)
+        )
+    
+    def _accumulate_block(self, days: np.ndarray, distance_miles: np.ndarray, heart_rate: np.ndarray,
+                          resting_heart_rate: np.ndarray, step_count: np.ndarray) -> None:
+        """Fold a block of records, one float64 array per metric with NaN for missing
+        values, into the running daily totals"""
+        block_days, day_index = np.unique(days, return_inverse=True)
+        day_records = [self._day_totals(day) for day in np.datetime_as_string(block_days).tolist()]
+        
+        def running_totals(key: str) -> np.ndarray:
+            return np.array([day_record[key] for day_record in day_records], dtype=np.float64)
+        
+        # Float sums start from each day's running total, so values are added
+        # in file order, as a record-by-record sum would, wherever the block
+        # boundaries fall
+        heart_rate_sum, heart_rate_count = self._sum_by_day(heart_rate, day_index, running_totals('heart_rate_sum'))
+        resting_heart_rate_sum, resting_heart_rate_count = self._sum_by_day(
+            resting_heart_rate, day_index, running_totals('resting_heart_rate_sum')
+        )
+        total_distance, _ = self._sum_by_day(distance_miles, day_index, running_totals('total_distance'))
+        total_steps, _ = self._sum_by_day(step_count, day_index, np.zeros(len(day_records)))
+        
+        running_sums = {
+            'heart_rate_sum': heart_rate_sum.tolist(),
+            'resting_heart_rate_sum': resting_heart_rate_sum.tolist(),
+            'total_distance': total_distance.tolist()
+        }
+        block_totals = {
+            'heart_rate_count': heart_rate_count.tolist(),
+            'resting_heart_rate_count': resting_heart_rate_count.tolist(),
+            'total_steps': total_steps.astype(np.int64).tolist(),
+            'records_count': np.bincount(day_index, minlength=len(day_records)).tolist()
+        }
+        
+        # One merge per day in the block rather than one per record
+        for i, day_record in enumerate(day_records):
+            for key, values in running_sums.items():
+                day_record[key] = values[i]
+            for key, values in block_totals.items():
+                day_record[key] += values[i]
+    
+    @staticmethod
+    def _sum_by_day(values: np.ndarray, day_index: np.ndarray, start: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-day sum of the non-missing values on top of start, and their count
         
-        self.parsed_data = parsed_records
-        return parsed_records
+        bincount adds weights in input order, so each day's start value goes
+        first and the values follow in block order.
+        """
+        present = ~np.isnan(values)
+        day_count = len(start)
+        return (
+            np.bincount(
+                np.concatenate((np.arange(day_count), day_index[present])),
+                weights=np.concatenate((start, values[present])),
+                minlength=day_count
+            ),
+            np.bincount(day_index[present], minlength=day_count)
+        )
+    
+    def _day_totals(self, day: str) -> Dict:
+        """Get the running totals for a day, starting them if needed"""
+        day_record = self._daily_totals.get(day)
+        if day_record is None:
+            day_record = self._daily_totals[day] = {
+                'heart_rate_sum': 0.0,
+                'heart_rate_count': 0,
+                'resting_heart_rate_sum': 0.0,
+                'resting_heart_rate_count': 0,
+                'total_steps': 0,
+                'total_distance': 0.0,
+                'records_count': 0
+            }
+        return day_record
     
     def _safe_float(self, value: str) -> Optional[float]:
         """Safely convert string to float, return None if invalid"""
-        if not value or value.strip() == '':
-            return None
         try:
-            return float(value)
+            return float(value) if value else None
         except (ValueError, TypeError):
             return None
     
     def _safe_int(self, value: str) -> Optional[int]:
         """Safely convert string to int, return None if invalid"""
-        if not value or value.strip() == '':
+        if not value:
             return None
         try:
-            return int(float(value))  # Handle cases like "1234.0"
+            return int(value)
         except (ValueError, TypeError):
+            pass
+        try:
+            return int(float(value))  # Handle cases like "1234.0"
+        except (ValueError, TypeError, OverflowError):
             return None
     
     def aggregate_daily_data(self) -> List[Dict]:
         """Aggregate hourly data into daily summaries"""
-        daily_data = {}
+        # Sort by date
+        dates = sorted(self._daily_totals)
+        day_records = [self._daily_totals[day] for day in dates]
         
-        for record in self.parsed_data:
-            date = record['date']
-            
-            if date not in daily_data:
-                daily_data[date] = {
-                    'date': date,
-                    'heart_rates': [],
-                    'resting_heart_rates': [],
-                    'total_steps': 0,
-                    'total_distance': 0.0,
-                    'records_count': 0
-                }
-            
-            day_record = daily_data[date]
-            
-            # Collect heart rate data
-            if record['heart_rate'] is not None:
-                day_record['heart_rates'].append(record['heart_rate'])
-            
-            if record['resting_heart_rate'] is not None:
-                day_record['resting_heart_rates'].append(record['resting_heart_rate'])
-            
-            # Sum steps and distance
-            if record['step_count'] is not None:
-                day_record['total_steps'] += record['step_count']
-            
-            if record['distance_miles'] is not None:
-                day_record['total_distance'] += record['distance_miles']
-            
-            day_record['records_count'] += 1
+        # Score every day in one pass
+        activity_levels = self._activity_level_array(
+            np.array([data['total_steps'] for data in day_records], dtype=np.float64),
+            np.array([data['total_distance'] for data in day_records], dtype=np.float64)
+        )
         
         # Calculate daily averages and totals
         aggregated_data = []
-        for date, data in daily_data.items():
+        for day, data, activity_level in zip(dates, day_records, activity_levels.tolist()):
             daily_summary = {
-                'date': date,
-                'avg_heart_rate': round(sum(data['heart_rates']) / len(data['heart_rates']), 1) if data['heart_rates'] else None,
-                'avg_resting_heart_rate': round(sum(data['resting_heart_rates']) / len(data['resting_heart_rates']), 1) if data['resting_heart_rates'] else None,
+                'date': day,
+                'avg_heart_rate': round(data['heart_rate_sum'] / data['heart_rate_count'], 1) if data['heart_rate_count'] else None,
+                'avg_resting_heart_rate': round(data['resting_heart_rate_sum'] / data['resting_heart_rate_count'], 1) if data['resting_heart_rate_count'] else None,
                 'total_steps': data['total_steps'],
                 'total_distance_miles': round(data['total_distance'], 2),
-                'activity_level': self._calculate_activity_level(data['total_steps'], data['total_distance']),
+                'activity_level': activity_level,
                 'records_count': data['records_count']
             }
             aggregated_data.append(daily_summary)
         
-        # Sort by date
-        aggregated_data.sort(key=lambda x: x['date'])
         return aggregated_data
     
-    def _calculate_activity_level(self, steps: int, distance: float) -> int:
-        """Calculate activity level score (1-100) based on steps and distance"""
-        # Base score from steps (0-70 points)
-        step_score = min(steps / 10000 * 70, 70)  # 10k steps = 70 points
+    @staticmethod
+    def _activity_level_array(steps: np.ndarray, distance: np.ndarray) -> np.ndarray:
+        """Calculate activity level scores (1-100) based on daily steps and distance"""
+        # Base score from steps (0-70 points), 10k steps = 70 points
+        step_score = np.minimum(steps / 10000 * 70, 70)
         
-        # Additional score from distance (0-30 points)
-        distance_score = min(distance * 10, 30)  # 3+ miles = 30 points
+        # Additional score from distance (0-30 points), 3+ miles = 30 points
+        distance_score = np.minimum(distance * 10, 30)
         
-        return int(step_score + distance_score)
+        return (step_score + distance_score).astype(np.int32)
     
     def convert_to_health_api_format(self, daily_data: List[Dict], user_id: str = "2", make_relative: bool = True) -> List[Dict]:
         """Convert aggregated data to our health API format
@@ -138,25 +366,15 @@ class AppleHealthParser:
         """
         api_records = []
         
-        # Calculate date offset if making dates relative
-        date_offset_days = 0
         if make_relative and daily_data:
-            from datetime import date, timedelta
-            # Find the most recent date in the data
-            most_recent_date = max(datetime.strptime(day['date'], '%Y-%m-%d').date() for day in daily_data)
-            today = date.today()
-            date_offset_days = (today - most_recent_date).days
-        
-        for day in daily_data:
-            # Adjust date if making relative
-            original_date = datetime.strptime(day['date'], '%Y-%m-%d').date()
-            if make_relative:
-                from datetime import timedelta
-                adjusted_date = original_date + timedelta(days=date_offset_days)
-                date_str = adjusted_date.isoformat()
-            else:
-                date_str = day['date']
-            
+            # Shift every date by the offset that moves the most recent date to today
+            original_dates = [date.fromisoformat(day['date']) for day in daily_data]
+            date_offset = date.today() - max(original_dates)
+            date_strs = [(original_date + date_offset).isoformat() for original_date in original_dates]
+        else:
+            date_strs = [day['date'] for day in daily_data]
+        
+        for day, date_str in zip(daily_data, date_strs):
             # Convert to our API format
             api_record = {
                 'user_id': user_id,
@@ -180,15 +398,50 @@ class AppleHealthParser:
         return api_records
     
     def upload_to_api(self, api_records: List[Dict]) -> List[Dict]:
-        """Upload processed data to the health monitoring API"""
+        """Upload processed data to the health monitoring API
+        
+        Records are sent to the bulk endpoint in pages of BULK_UPLOAD_PAGE_SIZE.
+        Falls back to one request per record if the server has no bulk endpoint.
+        """
+        results = []
+        
+        for start in range(0, len(api_records), BULK_UPLOAD_PAGE_SIZE):
+            page = api_records[start:start + BULK_UPLOAD_PAGE_SIZE]
+            
+            try:
+                response = self._session.post(
+                    f"{self.api_base_url}/api/health/data/bulk",
+                    json={'records': page}
+                )
+            except Exception as e:
+                results.extend({'status': 'error', 'date': record['date'], 'error': str(e)} for record in page)
+                continue
+            
+            if response.status_code == 404:
+                # Older server without the bulk endpoint
+                return results + self._upload_records(api_records[start:])
+            
+            if response.status_code == 201:
+                # One entry per record sent, in the same order
+                created = response.json()['data']
+                results.extend(
+                    {'status': 'success', 'date': record['date'], 'response': entry}
+                    for record, entry in zip(page, created)
+                )
+            else:
+                results.extend({'status': 'error', 'date': record['date'], 'error': response.text} for record in page)
+        
+        return results
+    
+    def _upload_records(self, api_records: List[Dict]) -> List[Dict]:
+        """Upload records one request at a time"""
         results = []
         
         for record in api_records:
             try:
-                response = requests.post(
+                response = self._session.post(
                     f"{self.api_base_url}/api/health/data",
-                    json=record,
-                    headers={'Content-Type': 'application/json'}
+                    json=record
                 )
                 
                 if response.status_code == 201:
@@ -222,6 +475,8 @@ class AppleHealthParser:
         resting_heart_rates = [d['avg_resting_heart_rate'] for d in daily_data if d['avg_resting_heart_rate']]
         daily_steps = [d['total_steps'] for d in daily_data if d['total_steps']]
         activity_levels = [d['activity_level'] for d in daily_data if d['activity_level']]
+        avg_hr = sum(heart_rates) / len(heart_rates) if heart_rates else None
+        avg_steps = sum(daily_steps) / len(daily_steps) if daily_steps else None
         
         report = {
             'data_period': {
@@ -230,29 +485,37 @@ class AppleHealthParser:
                 'total_days': len(daily_data)
             },
             'heart_rate_analysis': {
-                'avg_heart_rate': round(sum(heart_rates) / len(heart_rates), 1) if heart_rates else None,
+                'avg_heart_rate': round(avg_hr, 1) if heart_rates else None,
                 'avg_resting_heart_rate': round(sum(resting_heart_rates) / len(resting_heart_rates), 1) if resting_heart_rates else None,
                 'heart_rate_range': f"{min(heart_rates):.1f} - {max(heart_rates):.1f}" if heart_rates else None
             },
             'activity_analysis': {
-                'avg_daily_steps': round(sum(daily_steps) / len(daily_steps)) if daily_steps else None,
+                'avg_daily_steps': round(avg_steps) if daily_steps else None,
                 'total_steps': sum(daily_steps) if daily_steps else None,
                 'avg_activity_level': round(sum(activity_levels) / len(activity_levels)) if activity_levels else None,
                 'most_active_day': max(daily_data, key=lambda x: x['total_steps'])['date'] if daily_steps else None
             },
-            'health_insights': self._generate_health_insights(daily_data)
+            'health_insights': self._generate_health_insights(daily_data, avg_hr=avg_hr, avg_steps=avg_steps)
         }
         
         return report
     
-    def _generate_health_insights(self, daily_data: List[Dict]) -> List[str]:
-        """Generate health insights based on the data patterns"""
+    def _generate_health_insights(self, daily_data: List[Dict], *,
+                                  avg_hr: Optional[float] = None,
+                                  avg_steps: Optional[float] = None) -> List[str]:
+        """Generate health insights based on the data patterns
+        
+        avg_hr and avg_steps may be passed in when the caller has already
+        computed them; otherwise they are derived from daily_data.
+        """
         insights = []
         
         # Analyze heart rate patterns
-        heart_rates = [d['avg_heart_rate'] for d in daily_data if d['avg_heart_rate']]
-        if heart_rates:
-            avg_hr = sum(heart_rates) / len(heart_rates)
+        if avg_hr is None:
+            heart_rates = [d['avg_heart_rate'] for d in daily_data if d['avg_heart_rate']]
+            if heart_rates:
+                avg_hr = sum(heart_rates) / len(heart_rates)
+        if avg_hr is not None:
             if avg_hr > 100:
                 insights.append("⚠️ Average heart rate is elevated - consider medical consultation")
             elif avg_hr < 60:
@@ -261,9 +524,11 @@ class AppleHealthParser:
                 insights.append("✅ Heart rate patterns appear normal")
         
         # Analyze activity patterns
-        daily_steps = [d['total_steps'] for d in daily_data if d['total_steps']]
-        if daily_steps:
-            avg_steps = sum(daily_steps) / len(daily_steps)
+        if avg_steps is None:
+            daily_steps = [d['total_steps'] for d in daily_data if d['total_steps']]
+            if daily_steps:
+                avg_steps = sum(daily_steps) / len(daily_steps)
+        if avg_steps is not None:
             if avg_steps < 5000:
                 insights.append("⚠️ Daily step count is below recommended levels")
             elif avg_steps > 10000:
@@ -283,8 +548,8 @@ def main():
     
     # Parse the CSV file
     csv_file = "/home/ubuntu/upload/Export2.csv"
-    raw_data = parser.parse_csv_file(csv_file)
-    print(f"Parsed {len(raw_data)} raw health records")
+    record_count = parser.parse_csv_file(csv_file)
+    print(f"Parsed {record_count} raw health records")
     
     # Aggregate into daily summaries
     daily_data = parser.aggregate_daily_data()
@@ -0,0 +1,46 @@
+import os
+from urllib.parse import urlencode
+from uuid import uuid4
+
+from flask import request
+from flask_caching import Cache
+
+cache = Cache()
+
+# Seconds a cached read response is served before it is rebuilt
+STATUS_CACHE_TIMEOUT = 10
+LIST_CACHE_TIMEOUT = 30
+THRESHOLDS_CACHE_TIMEOUT = 60
+
+def init_cache(app):
+    """Use Redis when REDIS_URL is set, otherwise don't cache at all
+
+    Gunicorn runs several worker processes, and an in-process cache would
+    miss the invalidations made by the other workers, so without a shared
+    store every request goes to the database.
+    """
+    redis_url = os.environ.get('REDIS_URL')
+    if redis_url:
+        config = {'CACHE_TYPE': 'RedisCache', 'CACHE_REDIS_URL': redis_url}
+    else:
+        config = {'CACHE_TYPE': 'NullCache', 'CACHE_NO_NULL_WARNING': True}
+    config['CACHE_DEFAULT_TIMEOUT'] = LIST_CACHE_TIMEOUT
+    cache.init_app(app, config=config)
+
+def _generation_key(user_id):
+    return f'cache_generation:{user_id}'
+
+def user_cache_key():
+    """Cache key for a per-user GET: endpoint, user, generation and query string"""
+    user_id = request.args.get('user_id')
+    generation = cache.get(_generation_key(user_id)) or ''
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f'view:{request.endpoint}:{user_id}:{generation}:{query}'
+
+def is_cacheable(response):
+    """Only cache successful responses, never validation errors"""
+    return getattr(response, 'status_code', None) == 200
+
+def invalidate_user_cache(user_id):
+    """Drop every cached response for a user by starting a new generation"""
+    cache.set(_generation_key(str(user_id)), uuid4().hex, timeout=0)
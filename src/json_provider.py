@@ -0,0 +1,19 @@
+import orjson
+from flask.json.provider import JSONProvider
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson
+
+    Keys are sorted like Flask's default provider. Only dumps() and loads()
+    are overridden, so jsonify and request.get_json keep Flask's own
+    response and request handling. Models serialize dates with isoformat()
+    in to_dict(), so responses don't depend on how the provider formats
+    them.
+    """
+    option = orjson.OPT_SORT_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
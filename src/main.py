@@ -5,7 +5,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from flask import Flask
 from flask_cors import CORS
+from sqlalchemy.exc import IntegrityError
 from src.models.user import db
+from src.cache import init_cache
+from src.json_provider import OrjsonProvider
 from src.models.health_data import HealthData, Alert, UserProfile, Question
 from src.models.reminder import Reminder
 from src.routes.user import user_bp
@@ -14,6 +17,7 @@ from src.routes.user_profile import user_profile_bp
 from src.routes.reminders import reminders_bp
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
 # Enable CORS for all routes with explicit configuration
@@ -30,9 +34,30 @@ app.register_blueprint(reminders_bp)
 # uncomment if you need to use database
 app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Enough pooled connections for every gunicorn thread in a worker, with
+# headroom for bursts; recycle and ping so a server-side timeout never
+# surfaces as a failed request
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_timeout': 10,
+    'pool_recycle': 3600,
+    'pool_pre_ping': True
+}
 db.init_app(app)
+init_cache(app)
 with app.app_context():
     db.create_all()
+    # create_all() skips tables that already exist, so also add any indexes
+    # declared after an existing table was created
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(db.engine, checkfirst=True)
+            except IntegrityError:
+                # Rows stored before a unique index existed can break it;
+                # those are cleaned up by hand, see dedupe_device_readings.py
+                app.logger.warning('Could not create unique index %s, existing rows conflict', index.name)
 
 @app.route('/api/health')
 def health_check():
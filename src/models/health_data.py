@@ -1,13 +1,42 @@
 from src.models.user import db
 from datetime import datetime
-import json
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
+
+# JSON documents; stored as binary JSONB on PostgreSQL, JSON text elsewhere
+JSONDocument = db.JSON().with_variant(JSONB(), 'postgresql')
+
+def _iso(value):
+    """ISO 8601 string for a date/datetime column, None when unset"""
+    return value.isoformat() if value else None
+
+# Readings imported from a device are unique per user and timestamp, so a
+# re-import updates them; manual and simulated readings may repeat
+DEVICE_DATA_SOURCE = 'apple_watch'
+IS_DEVICE_READING = text("data_source = 'apple_watch'")
+
+def dialect_insert(table):
+    """INSERT with ON CONFLICT support for the database the app is bound to"""
+    dialect = postgresql if db.engine.dialect.name == 'postgresql' else sqlite
+    return dialect.insert(table)
 
 class HealthData(db.Model):
     __tablename__ = 'health_data'
+    __table_args__ = (
+        # Per-user time range scans and per-user source filters
+        db.Index('ix_health_data_user_id_timestamp', 'user_id', 'timestamp'),
+        db.Index('ix_health_data_user_id_data_source', 'user_id', 'data_source'),
+        # ON CONFLICT target for device upserts
+        db.Index(
+            'uq_health_data_device_user_id_timestamp', 'user_id', 'timestamp', unique=True,
+            sqlite_where=IS_DEVICE_READING, postgresql_where=IS_DEVICE_READING
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.String(100), nullable=False, index=True)
-    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    user_id = db.Column(db.String(100), nullable=False)
+    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
     # Vital signs
     heart_rate = db.Column(db.Integer)
@@ -33,62 +62,87 @@ class HealthData(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    @classmethod
+    def bulk_to_dict(cls, rows):
+        """Serialize many rows in one pass"""
+        iso = _iso
+        result = []
+        append = result.append
+        for row in rows:
+            systolic = row.blood_pressure_systolic
+            diastolic = row.blood_pressure_diastolic
+            append({
+                'id': row.id,
+                'user_id': row.user_id,
+                'timestamp': iso(row.timestamp),
+                'heart_rate': row.heart_rate,
+                'blood_pressure': f"{systolic}/{diastolic}" if systolic and diastolic else None,
+                'blood_pressure_systolic': systolic,
+                'blood_pressure_diastolic': diastolic,
+                'sleep_hours': row.sleep_hours,
+                'sleep_quality': row.sleep_quality,
+                'steps': row.steps,
+                'activity_level': row.activity_level,
+                'mood': row.mood,
+                'notes': row.notes,
+                'is_manual_entry': row.is_manual_entry,
+                'data_source': row.data_source,
+                'created_at': iso(row.created_at),
+                'updated_at': iso(row.updated_at)
+            })
+        return result
+    
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
-            'heart_rate': self.heart_rate,
-            'blood_pressure': f"{self.blood_pressure_systolic}/{self.blood_pressure_diastolic}" if self.blood_pressure_systolic and self.blood_pressure_diastolic else None,
-            'blood_pressure_systolic': self.blood_pressure_systolic,
-            'blood_pressure_diastolic': self.blood_pressure_diastolic,
-            'sleep_hours': self.sleep_hours,
-            'sleep_quality': self.sleep_quality,
-            'steps': self.steps,
-            'activity_level': self.activity_level,
-            'mood': self.mood,
-            'notes': self.notes,
-            'is_manual_entry': self.is_manual_entry,
-            'data_source': self.data_source,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
-        }
+        return self.bulk_to_dict((self,))[0]
 
 class Alert(db.Model):
     __tablename__ = 'alerts'
+    __table_args__ = (
+        # Per-user active alert lists, newest first
+        db.Index('ix_alerts_user_id_is_dismissed_created_at', 'user_id', 'is_dismissed', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.String(100), nullable=False, index=True)
+    user_id = db.Column(db.String(100), nullable=False)
     alert_type = db.Column(db.String(20), nullable=False)  # alert, warning, info
     title = db.Column(db.String(200), nullable=False)
     message = db.Column(db.Text, nullable=False)
     metric = db.Column(db.String(50))  # heartRate, bloodPressure, sleep, activity
     value = db.Column(db.String(50))
-    threshold_data = db.Column(db.Text)  # JSON string of threshold info
+    threshold_data = db.Column(JSONDocument)  # Threshold info
     
     is_dismissed = db.Column(db.Boolean, default=False)
     is_acknowledged = db.Column(db.Boolean, default=False)
     
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
     dismissed_at = db.Column(db.DateTime)
     acknowledged_at = db.Column(db.DateTime)
     
+    @classmethod
+    def bulk_to_dict(cls, rows):
+        """Serialize many rows in one pass"""
+        iso = _iso
+        return [
+            {
+                'id': row.id,
+                'user_id': row.user_id,
+                'type': row.alert_type,
+                'title': row.title,
+                'message': row.message,
+                'metric': row.metric,
+                'value': row.value,
+                'threshold_data': row.threshold_data,
+                'is_dismissed': row.is_dismissed,
+                'is_acknowledged': row.is_acknowledged,
+                'timestamp': iso(row.created_at),
+                'dismissed_at': iso(row.dismissed_at),
+                'acknowledged_at': iso(row.acknowledged_at)
+            }
+            for row in rows
+        ]
+    
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'type': self.alert_type,
-            'title': self.title,
-            'message': self.message,
-            'metric': self.metric,
-            'value': self.value,
-            'threshold_data': json.loads(self.threshold_data) if self.threshold_data else None,
-            'is_dismissed': self.is_dismissed,
-            'is_acknowledged': self.is_acknowledged,
-            'timestamp': self.created_at.isoformat() if self.created_at else None,
-            'dismissed_at': self.dismissed_at.isoformat() if self.dismissed_at else None,
-            'acknowledged_at': self.acknowledged_at.isoformat() if self.acknowledged_at else None
-        }
+        return self.bulk_to_dict((self,))[0]
 
 class UserProfile(db.Model):
     __tablename__ = 'user_profiles'
@@ -102,24 +156,33 @@ class UserProfile(db.Model):
     monitored_user_id = db.Column(db.String(100))  # ID of the parent they're monitoring
     
     # Threshold settings (JSON)
-    alert_thresholds = db.Column(db.Text)  # JSON string of customizable thresholds
+    alert_thresholds = db.Column(JSONDocument)  # Customizable thresholds
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     last_login = db.Column(db.DateTime)
     
+    @classmethod
+    def bulk_to_dict(cls, rows):
+        """Serialize many rows in one pass"""
+        iso = _iso
+        return [
+            {
+                'id': row.id,
+                'user_id': row.user_id,
+                'name': row.name,
+                'user_type': row.user_type,
+                'monitored_user_id': row.monitored_user_id,
+                'alert_thresholds': row.alert_thresholds,
+                'created_at': iso(row.created_at),
+                'updated_at': iso(row.updated_at),
+                'last_login': iso(row.last_login)
+            }
+            for row in rows
+        ]
+    
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'name': self.name,
-            'user_type': self.user_type,
-            'monitored_user_id': self.monitored_user_id,
-            'alert_thresholds': json.loads(self.alert_thresholds) if self.alert_thresholds else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'last_login': self.last_login.isoformat() if self.last_login else None
-        }
+        return self.bulk_to_dict((self,))[0]
 
 class Question(db.Model):
     __tablename__ = 'questions'
@@ -132,13 +195,22 @@ class Question(db.Model):
     asked_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     responded_at = db.Column(db.DateTime)
     
+    @classmethod
+    def bulk_to_dict(cls, rows):
+        """Serialize many rows in one pass"""
+        iso = _iso
+        return [
+            {
+                'id': row.id,
+                'user_id': row.user_id,
+                'question_text': row.question_text,
+                'response': row.response,
+                'asked_at': iso(row.asked_at),
+                'responded_at': iso(row.responded_at)
+            }
+            for row in rows
+        ]
+    
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'question_text': self.question_text,
-            'response': self.response,
-            'asked_at': self.asked_at.isoformat() if self.asked_at else None,
-            'responded_at': self.responded_at.isoformat() if self.responded_at else None
-        }
+        return self.bulk_to_dict((self,))[0]
 
@@ -1,8 +1,17 @@
 from datetime import datetime
+from sqlalchemy import select
 from src.models.user import db
 
+def _iso(value):
+    """ISO 8601 string for a date/datetime column, None when unset"""
+    return value.isoformat() if value else None
+
 class Reminder(db.Model):
     __tablename__ = 'reminders'
+    __table_args__ = (
+        # Matches the filters in get_active_reminders_for_today
+        db.Index('ix_reminders_user_id_status_reminder_type_start_date', 'user_id', 'status', 'reminder_type', 'start_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.String(50), nullable=False)  # Parent user ID
@@ -17,29 +26,46 @@ class Reminder(db.Model):
     completed_at = db.Column(db.DateTime)
     created_by = db.Column(db.String(50))  # Caregiver user ID
     
+    @classmethod
+    def bulk_to_dict(cls, rows):
+        """Serialize many rows in one pass"""
+        iso = _iso
+        return [
+            {
+                'id': row.id,
+                'user_id': row.user_id,
+                'title': row.title,
+                'description': row.description,
+                'priority': row.priority,
+                'status': row.status,
+                'reminder_type': row.reminder_type,
+                'start_date': iso(row.start_date),
+                'last_completed_date': iso(row.last_completed_date),
+                'created_at': iso(row.created_at),
+                'completed_at': iso(row.completed_at),
+                'created_by': row.created_by
+            }
+            for row in rows
+        ]
+    
     def to_dict(self):
-        return {
-            'id': self.id,
-            'user_id': self.user_id,
-            'title': self.title,
-            'description': self.description,
-            'priority': self.priority,
-            'status': self.status,
-            'reminder_type': self.reminder_type,
-            'start_date': self.start_date.isoformat() if self.start_date else None,
-            'last_completed_date': self.last_completed_date.isoformat() if self.last_completed_date else None,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'created_by': self.created_by
-        }
+        return self.bulk_to_dict((self,))[0]
+    
+    @staticmethod
+    def fetch_rows(*criteria, order_by):
+        """Fetch matching reminders as plain rows for read-only listing"""
+        return db.session.execute(
+            select(Reminder.__table__).where(*criteria).order_by(*order_by)
+        ).all()
     
     @staticmethod
     def get_active_reminders(user_id):
         """Get all active reminders for a user"""
-        return Reminder.query.filter_by(
-            user_id=user_id, 
-            status='active'
-        ).order_by(Reminder.created_at.desc()).all()
+        return Reminder.fetch_rows(
+            Reminder.user_id == user_id,
+            Reminder.status == 'active',
+            order_by=(Reminder.created_at.desc(),)
+        )
     
     @staticmethod
     def get_completed_reminders(user_id, days=14):
@@ -47,11 +73,12 @@ class Reminder(db.Model):
         from datetime import datetime, timedelta
         cutoff_date = datetime.utcnow() - timedelta(days=days)
         
-        return Reminder.query.filter(
+        return Reminder.fetch_rows(
             Reminder.user_id == user_id,
             Reminder.status == 'completed',
-            Reminder.completed_at >= cutoff_date
-        ).order_by(Reminder.completed_at.desc()).all()
+            Reminder.completed_at >= cutoff_date,
+            order_by=(Reminder.completed_at.desc(),)
+        )
     
     def mark_completed(self):
         """Mark reminder as completed"""
@@ -68,11 +95,12 @@ class Reminder(db.Model):
     @staticmethod
     def get_daily_reminders(user_id):
         """Get all daily reminders for a user"""
-        return Reminder.query.filter_by(
-            user_id=user_id, 
-            reminder_type='daily',
-            status='active'
-        ).order_by(Reminder.created_at.desc()).all()
+        return Reminder.fetch_rows(
+            Reminder.user_id == user_id,
+            Reminder.reminder_type == 'daily',
+            Reminder.status == 'active',
+            order_by=(Reminder.created_at.desc(),)
+        )
     
     @staticmethod
     def get_active_reminders_for_today(user_id):
@@ -80,23 +108,24 @@ class Reminder(db.Model):
         from datetime import date
         today = date.today()
         
-        # Get event reminders that are active and should start today or earlier
-        event_reminders = Reminder.query.filter(
-            Reminder.user_id == user_id,
-            Reminder.reminder_type == 'event',
-            Reminder.status == 'active',
-            Reminder.start_date <= today
-        ).all()
-        
-        # Get daily reminders that haven't been completed today
-        daily_reminders = Reminder.query.filter(
+        # Event reminders that should start today or earlier, plus daily
+        # reminders that haven't been completed today, in one query
+        return Reminder.fetch_rows(
             Reminder.user_id == user_id,
-            Reminder.reminder_type == 'daily',
             Reminder.status == 'active',
             db.or_(
-                Reminder.last_completed_date.is_(None),
-                Reminder.last_completed_date < today
-            )
-        ).all()
-        
-        return event_reminders + daily_reminders
+                db.and_(
+                    Reminder.reminder_type == 'event',
+                    Reminder.start_date <= today
+                ),
+                db.and_(
+                    Reminder.reminder_type == 'daily',
+                    db.or_(
+                        Reminder.last_completed_date.is_(None),
+                        Reminder.last_completed_date < today
+                    )
+                )
+            ),
+            # Events before daily reminders, as when they were fetched separately
+            order_by=(Reminder.reminder_type.desc(), Reminder.id)
+        )
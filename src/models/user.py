@@ -1,6 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 
-db = SQLAlchemy()
+# Sessions are scoped to a request, so objects don't need to be expired and
+# reloaded after a commit just to serialize them in the response
+db = SQLAlchemy(session_options={'expire_on_commit': False})
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -1,12 +1,36 @@
-from flask import Blueprint, request, jsonify
-from datetime import datetime, timedelta
-from src.models.health_data import db, HealthData, Alert, UserProfile, Question
-import json
+from flask import Blueprint, g, request, jsonify, make_response
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import bindparam, delete, func, select
+from sqlalchemy.exc import IntegrityError
+import math
+import numpy as np
+import re
+from types import SimpleNamespace
+from src.models.health_data import db, dialect_insert, DEVICE_DATA_SOURCE, IS_DEVICE_READING, HealthData, Alert, UserProfile, Question
+from src.cache import cache, user_cache_key, is_cacheable, invalidate_user_cache, STATUS_CACHE_TIMEOUT, LIST_CACHE_TIMEOUT, THRESHOLDS_CACHE_TIMEOUT
 import random
 
 health_bp = Blueprint('health', __name__)
 
+@health_bp.after_request
+def answer_conditional_get(response):
+    """Turn a cached 200 whose ETag the client already has into a 304"""
+    if request.method == 'GET' and response.status_code == 200 and 'ETag' in response.headers:
+        response.make_conditional(request)
+    return response
+
+# Used for any threshold a user hasn't customized
+DEFAULT_ALERT_THRESHOLDS = {
+    'heartRateMin': 60,
+    'heartRateMax': 100,
+    'bpSystolicMax': 140,
+    'bpDiastolicMax': 90,
+    'sleepHoursMin': 6,
+    'activityLevelMin': 30
+}
+
 @health_bp.route('/health/data', methods=['GET'])
+@cache.cached(timeout=LIST_CACHE_TIMEOUT, make_cache_key=user_cache_key, response_filter=is_cacheable)
 def get_health_data():
     """Get health data for a user"""
     user_id = request.args.get('user_id')
@@ -19,17 +43,36 @@ def get_health_data():
     end_date = datetime.utcnow() + timedelta(days=1)  # Add 1 day to include today
     start_date = end_date - timedelta(days=days+1)  # Adjust start date accordingly
     
-    # Query health data
-    health_data = HealthData.query.filter(
+    criteria = (
         HealthData.user_id == user_id,
         HealthData.timestamp >= start_date,
         HealthData.timestamp <= end_date
-    ).order_by(HealthData.timestamp.asc()).all()
+    )
     
-    return jsonify({
-        'data': [item.to_dict() for item in health_data],
+    # Fingerprint the matching rows; any insert, update or delete in the
+    # range changes the count, the highest id or the latest update
+    count, last_id, last_updated = db.session.execute(
+        select(func.count(), func.max(HealthData.id), func.max(HealthData.updated_at)).where(*criteria)
+    ).one()
+    etag = f"{count}-{last_id or 0}-{last_updated.timestamp() if last_updated else 0}"
+    
+    # The client already has this data, skip loading and serializing it
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+        response.set_etag(etag, weak=True)
+        return response
+    
+    # Query health data as plain rows; the list view never needs ORM instances
+    health_data = db.session.execute(
+        select(HealthData.__table__).where(*criteria).order_by(HealthData.timestamp.asc())
+    ).all()
+    
+    response = jsonify({
+        'data': HealthData.bulk_to_dict(health_data),
         'count': len(health_data)
     })
+    response.set_etag(etag, weak=True)
+    return response
 
 @health_bp.route('/health/data', methods=['POST'])
 def add_health_data():
@@ -40,41 +83,103 @@ def add_health_data():
         return jsonify({'error': 'user_id is required'}), 400
     
     try:
-        # Parse timestamp if provided, otherwise use current time
-        timestamp = datetime.utcnow()
-        if 'timestamp' in data:
-            timestamp = datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00'))
-        
-        health_entry = HealthData(
-            user_id=data['user_id'],
-            timestamp=timestamp,
-            heart_rate=data.get('heart_rate'),
-            blood_pressure_systolic=data.get('blood_pressure_systolic'),
-            blood_pressure_diastolic=data.get('blood_pressure_diastolic'),
-            sleep_hours=data.get('sleep_hours'),
-            sleep_quality=data.get('sleep_quality'),
-            steps=data.get('steps'),
-            activity_level=data.get('activity_level'),
-            mood=data.get('mood'),
-            notes=data.get('notes'),
-            is_manual_entry=data.get('is_manual_entry', True),
-            data_source=data.get('data_source', 'manual')
-        )
-        
+        health_entry = build_health_entry(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
         db.session.add(health_entry)
-        db.session.commit()
         
-        # Check for alerts after adding data
+        # Check for alerts, then commit the entry and its alerts together
         check_and_create_alerts(data['user_id'], health_entry)
         
-        # Commit alerts to database
         db.session.commit()
+        invalidate_user_cache(data['user_id'])
         
         return jsonify({
             'message': 'Health data added successfully',
             'data': health_entry.to_dict()
         }), 201
         
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'A device reading already exists for this timestamp'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@health_bp.route('/health/data/bulk', methods=['POST'])
+def add_health_data_bulk():
+    """Add many health data entries in a single request"""
+    data = request.get_json(silent=True)
+    records = data.get('records') if isinstance(data, dict) else None
+    
+    if not records or not isinstance(records, list):
+        return jsonify({'error': 'records must be a non-empty list'}), 400
+    
+    if any(not isinstance(record, dict) or 'user_id' not in record for record in records):
+        return jsonify({'error': 'user_id is required for every record'}), 400
+    
+    try:
+        rows = [build_health_row(record) for record in records]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        # Device readings that carry their own timestamp are upserted, so
+        # re-sending one updates it (the last copy in a request wins); every
+        # other record is a new reading
+        device_keys = [
+            (row['user_id'], row['timestamp'])
+            if 'timestamp' in record and row['data_source'] == DEVICE_DATA_SOURCE else None
+            for record, row in zip(records, rows)
+        ]
+        new_rows = [row for row, key in zip(rows, device_keys) if key is None]
+        device_rows = {key: row for row, key in zip(rows, device_keys) if key is not None}
+        
+        new_results = []
+        device_results = {}
+        if new_rows:
+            stmt = HealthData.__table__.insert().returning(*HealthData.__table__.c, sort_by_parameter_order=True)
+            new_results = db.session.execute(stmt, new_rows).all()
+        # An upsert that updates keeps the stored created_at, so the device
+        # rows that come back with this one are the newly inserted readings
+        now = datetime.utcnow()
+        if device_rows:
+            for row in device_rows.values():
+                row['created_at'] = row['updated_at'] = now
+            stmt = dialect_insert(HealthData.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['user_id', 'timestamp'],
+                index_where=IS_DEVICE_READING,
+                set_={column: stmt.excluded[column] for column in UPSERT_COLUMNS}
+            ).returning(*HealthData.__table__.c, sort_by_parameter_order=True)
+            device_results = dict(zip(device_rows, db.session.execute(stmt, list(device_rows.values())).all()))
+        
+        # Check for alerts on new readings only, so re-sending a device
+        # reading doesn't raise its alerts again
+        inserted_rows = new_results + [row for row in device_results.values() if row.created_at == now]
+        for health_row in inserted_rows:
+            check_and_create_alerts(health_row.user_id, health_row)
+        
+        # One entry per record, in request order
+        new_results = iter(new_results)
+        health_rows = [device_results[key] if key is not None else next(new_results) for key in device_keys]
+        saved = HealthData.bulk_to_dict(health_rows)
+        saved_count = len({row.id for row in health_rows})
+        db.session.commit()
+        for user_id in {row.user_id for row in health_rows}:
+            invalidate_user_cache(user_id)
+        
+        return jsonify({
+            'message': f'Saved {saved_count} health data entries',
+            'data': saved,
+            'count': saved_count
+        }), 201
+        
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'A device reading already exists for this timestamp'}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -90,14 +195,19 @@ def generate_simulated_data():
         return jsonify({'error': 'user_id is required'}), 400
     
     try:
-        # Clear existing simulated data for this user
-        HealthData.query.filter(
-            HealthData.user_id == user_id,
-            HealthData.data_source == 'simulation'
-        ).delete()
+        # Clear existing simulated data for this user with a plain DELETE;
+        # nothing in the session needs to be kept in sync with those rows
+        db.session.execute(
+            delete(HealthData.__table__).where(
+                HealthData.user_id == user_id,
+                HealthData.data_source == 'simulation'
+            )
+        )
         
-        # Generate simulated data
-        generated_data = []
+        # Lay out the simulated timestamps, then generate every point at once
+        timestamps = []
+        hours = []
+        is_daily_summary = []
         now = datetime.utcnow()
         
         for day in range(days):
@@ -108,23 +218,26 @@ def generate_simulated_data():
                 # Today - hourly data
                 for hour in range(24):
                     if hour <= now.hour:
-                        timestamp = datetime(date.year, date.month, date.date().day, hour)
-                        entry = generate_health_data_point(user_id, timestamp, hour)
-                        generated_data.append(entry)
+                        timestamps.append(datetime(date.year, date.month, date.date().day, hour))
+                        hours.append(hour)
+                        is_daily_summary.append(False)
             else:
                 # Previous days - daily summary
-                timestamp = datetime(date.year, date.month, date.date().day, 12)
-                entry = generate_health_data_point(user_id, timestamp, 12, is_daily_summary=True)
-                generated_data.append(entry)
+                timestamps.append(datetime(date.year, date.month, date.date().day, 12))
+                hours.append(12)
+                is_daily_summary.append(True)
         
-        # Add all entries to database
-        for entry in generated_data:
-            db.session.add(entry)
+        generated_data = generate_health_data_points(user_id, timestamps, hours, is_daily_summary)
+        
+        # Add all entries to database in a single executemany INSERT
+        if generated_data:
+            db.session.execute(HealthData.__table__.insert(), generated_data)
         
         db.session.commit()
         
         # Generate some alerts based on the simulated data
         generate_sample_alerts(user_id)
+        invalidate_user_cache(user_id)
         
         return jsonify({
             'message': f'Generated {len(generated_data)} simulated health data entries',
@@ -136,6 +249,7 @@ def generate_simulated_data():
         return jsonify({'error': str(e)}), 500
 
 @health_bp.route('/alerts', methods=['GET'])
+@cache.cached(timeout=LIST_CACHE_TIMEOUT, make_cache_key=user_cache_key, response_filter=is_cacheable)
 def get_alerts():
     """Get alerts for a user"""
     user_id = request.args.get('user_id')
@@ -144,15 +258,15 @@ def get_alerts():
     if not user_id:
         return jsonify({'error': 'user_id is required'}), 400
     
-    query = Alert.query.filter(Alert.user_id == user_id)
+    query = select(Alert.__table__).where(Alert.user_id == user_id)
     
     if not include_dismissed:
-        query = query.filter(Alert.is_dismissed == False)
+        query = query.where(Alert.is_dismissed == False)
     
-    alerts = query.order_by(Alert.created_at.desc()).limit(20).all()
+    alerts = db.session.execute(query.order_by(Alert.created_at.desc()).limit(20)).all()
     
     return jsonify({
-        'alerts': [alert.to_dict() for alert in alerts],
+        'alerts': Alert.bulk_to_dict(alerts),
         'count': len(alerts)
     })
 
@@ -164,6 +278,7 @@ def dismiss_alert(alert_id):
     alert.dismissed_at = datetime.utcnow()
     
     db.session.commit()
+    invalidate_user_cache(alert.user_id)
     
     return jsonify({'message': 'Alert dismissed successfully'})
 
@@ -174,12 +289,14 @@ def delete_alert(alert_id):
         alert = Alert.query.get_or_404(alert_id)
         db.session.delete(alert)
         db.session.commit()
+        invalidate_user_cache(alert.user_id)
         return jsonify({'message': 'Alert deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
 @health_bp.route('/status', methods=['GET'])
+@cache.cached(timeout=STATUS_CACHE_TIMEOUT, make_cache_key=user_cache_key, response_filter=is_cacheable)
 def get_overall_status():
     """Get overall health status for a user"""
     user_id = request.args.get('user_id')
@@ -187,159 +304,260 @@ def get_overall_status():
     if not user_id:
         return jsonify({'error': 'user_id is required'}), 400
     
-    # Get recent alerts
-    recent_alerts = Alert.query.filter(
-        Alert.user_id == user_id,
-        Alert.is_dismissed == False,
-        Alert.created_at >= datetime.utcnow() - timedelta(hours=24)
-    ).all()
+    # Count recent alerts by type
+    alert_counts = dict(db.session.execute(
+        select(Alert.alert_type, func.count()).where(
+            Alert.user_id == user_id,
+            Alert.is_dismissed == False,
+            Alert.created_at >= datetime.utcnow() - timedelta(hours=24)
+        ).group_by(Alert.alert_type)
+    ).all())
+    critical_count = alert_counts.get('alert', 0)
+    warning_count = alert_counts.get('warning', 0)
     
     # Determine overall status
-    critical_alerts = [a for a in recent_alerts if a.alert_type == 'alert']
-    warning_alerts = [a for a in recent_alerts if a.alert_type == 'warning']
-    
-    if critical_alerts:
+    if critical_count:
         status = 'alert'
         message = 'Immediate attention required'
-    elif len(warning_alerts) > 1:
+    elif warning_count > 1:
         status = 'warning'
         message = 'Some patterns need attention'
-    elif warning_alerts:
+    elif warning_count:
         status = 'warning'
         message = 'Some patterns need attention'
     else:
         status = 'good'
         message = 'Everything looks normal'
     
-    # Get latest health data
-    latest_data = HealthData.query.filter(
-        HealthData.user_id == user_id
-    ).order_by(HealthData.timestamp.desc()).first()
+    # Get the timestamp of the latest health data
+    last_updated = db.session.scalar(
+        select(func.max(HealthData.timestamp)).where(HealthData.user_id == user_id)
+    )
     
     return jsonify({
         'status': status,
         'message': message,
         'alert_counts': {
-            'urgent': len(critical_alerts),
-            'warning': len(warning_alerts),
-            'info': len([a for a in recent_alerts if a.alert_type == 'info'])
+            'urgent': critical_count,
+            'warning': warning_count,
+            'info': alert_counts.get('info', 0)
         },
-        'last_updated': latest_data.timestamp.isoformat() if latest_data else None
+        'last_updated': last_updated.isoformat() if last_updated else None
     })
 
-def generate_health_data_point(user_id, timestamp, hour, is_daily_summary=False):
-    """Generate a single health data point"""
-    is_night_time = hour < 6 or hour > 22
-    
-    # Generate realistic values with some randomness
-    heart_rate = max(60, min(100, int(72 + (random.random() - 0.5) * 20 + (-10 if is_night_time else 0))))
-    
-    systolic = max(90, min(160, int(120 + (random.random() - 0.5) * 30)))
-    diastolic = max(60, min(100, int(80 + (random.random() - 0.5) * 20)))
-    
-    sleep_hours = round((6.5 + random.random() * 2), 1) if is_daily_summary else None
-    sleep_quality = int(6 + random.random() * 4) if is_daily_summary else None
-    
-    if not is_night_time:
-        activity_level = int(20 + random.random() * 60)
-        steps = int(3000 + random.random() * 7000) if is_daily_summary else int((3000 + random.random() * 7000) / 16)
-    else:
-        activity_level = int(random.random() * 10)
-        steps = int(random.random() * 100)
-    
-    return HealthData(
-        user_id=user_id,
-        timestamp=timestamp,
-        heart_rate=heart_rate,
-        blood_pressure_systolic=systolic,
-        blood_pressure_diastolic=diastolic,
-        sleep_hours=sleep_hours,
-        sleep_quality=sleep_quality,
-        steps=steps,
-        activity_level=activity_level,
-        data_source='simulation',
-        is_manual_entry=False
-    )
+# Columns refreshed when a bulk upload hits an existing device reading
+UPSERT_COLUMNS = (
+    'heart_rate', 'blood_pressure_systolic', 'blood_pressure_diastolic',
+    'sleep_hours', 'sleep_quality', 'steps', 'activity_level',
+    'mood', 'notes', 'is_manual_entry', 'updated_at'
+)
+
+# Payload measurements and the type of the column they are stored in
+NUMERIC_FIELDS = {
+    'heart_rate': int,
+    'blood_pressure_systolic': int,
+    'blood_pressure_diastolic': int,
+    'sleep_hours': float,
+    'sleep_quality': int,
+    'steps': int,
+    'activity_level': int
+}
+
+def _parse_number(field, value, column_type):
+    """Convert a payload measurement, accepting numeric strings
+    
+    Whole numbers for an integer column become int, everything else float,
+    as SQLite stores them.
+    """
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        number = math.nan
+    if not math.isfinite(number):
+        raise ValueError(f'{field} must be a number')
+    return int(number) if column_type is int and number.is_integer() else number
+
+def build_health_row(data):
+    """Build the health_data column values for an API payload
+    
+    Raises ValueError for a measurement or timestamp that can't be parsed.
+    """
+    # Parse timestamp if provided, otherwise use current time
+    timestamp = datetime.utcnow()
+    if 'timestamp' in data:
+        try:
+            timestamp = datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
+            raise ValueError('timestamp must be an ISO 8601 date and time')
+        # Stored timestamps are naive UTC; convert offsets so the response
+        # and later reads agree
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    return {
+        'user_id': data['user_id'],
+        'timestamp': timestamp,
+        **{field: _parse_number(field, data.get(field), column_type) for field, column_type in NUMERIC_FIELDS.items()},
+        'mood': data.get('mood'),
+        'notes': data.get('notes'),
+        'is_manual_entry': data.get('is_manual_entry', True),
+        'data_source': data.get('data_source', 'manual')
+    }
+
+def build_health_entry(data):
+    """Build a HealthData entry from an API payload"""
+    return HealthData(**build_health_row(data))
+
+def generate_health_data_points(user_id, timestamps, hours, is_daily_summary):
+    """Generate the column values for a batch of simulated health data points"""
+    n = len(timestamps)
+    hours = np.asarray(hours)
+    is_daily_summary = np.asarray(is_daily_summary, dtype=bool)
+    is_night_time = (hours < 6) | (hours > 22)
+    
+    # Generate realistic values with some randomness, one draw per column
+    rng = np.random.default_rng()
+    heart_rate = np.clip((72 + (rng.random(n) - 0.5) * 20 - 10 * is_night_time).astype(np.int64), 60, 100)
+    
+    systolic = np.clip((120 + (rng.random(n) - 0.5) * 30).astype(np.int64), 90, 160)
+    diastolic = np.clip((80 + (rng.random(n) - 0.5) * 20).astype(np.int64), 60, 100)
+    
+    sleep_hours = np.round(6.5 + rng.random(n) * 2, 1)
+    sleep_quality = (6 + rng.random(n) * 4).astype(np.int64)
+    
+    day_steps = 3000 + rng.random(n) * 7000
+    activity_level = np.where(
+        is_night_time,
+        rng.random(n) * 10,
+        20 + rng.random(n) * 60
+    ).astype(np.int64)
+    steps = np.where(
+        is_night_time,
+        rng.random(n) * 100,
+        np.where(is_daily_summary, day_steps, day_steps / 16)
+    ).astype(np.int64)
+    
+    # Sleep is only reported on daily summaries
+    daily = is_daily_summary.tolist()
+    columns = {
+        'timestamp': timestamps,
+        'heart_rate': heart_rate.tolist(),
+        'blood_pressure_systolic': systolic.tolist(),
+        'blood_pressure_diastolic': diastolic.tolist(),
+        'sleep_hours': [value if is_daily else None for value, is_daily in zip(sleep_hours.tolist(), daily)],
+        'sleep_quality': [value if is_daily else None for value, is_daily in zip(sleep_quality.tolist(), daily)],
+        'steps': steps.tolist(),
+        'activity_level': activity_level.tolist()
+    }
+    
+    return [
+        dict(zip(columns, values), user_id=user_id, data_source='simulation', is_manual_entry=False)
+        for values in zip(*columns.values())
+    ]
+
+# Built once so every lookup reuses the same compiled statement
+GET_ALERT_THRESHOLDS = select(UserProfile.alert_thresholds).where(
+    UserProfile.user_id == bindparam('user_id')
+)
+
+def get_alert_thresholds(user_id):
+    """Get a user's alert thresholds, looked up once per request"""
+    thresholds = g.setdefault('alert_thresholds', {})
+    if user_id not in thresholds:
+        thresholds[user_id] = load_alert_thresholds(user_id)
+    return thresholds[user_id]
+
+@cache.memoize(timeout=THRESHOLDS_CACHE_TIMEOUT)
+def load_alert_thresholds(user_id):
+    """Load a user's alert thresholds, shared across workers only with Redis"""
+    alert_thresholds = db.session.scalar(GET_ALERT_THRESHOLDS, {'user_id': user_id})
+    if not alert_thresholds:
+        # Use default thresholds if none are set for the user
+        return DEFAULT_ALERT_THRESHOLDS
+    # Fill in any threshold the user hasn't customized
+    return {**DEFAULT_ALERT_THRESHOLDS, **alert_thresholds}
 
 def check_and_create_alerts(user_id, health_data):
     """Check health data and create alerts if needed"""
     alerts_to_create = []
     
-    user_profile = UserProfile.query.filter_by(user_id=user_id).first()
-    if not user_profile or not user_profile.alert_thresholds:
-        # Use default thresholds if none are set for the user
-        thresholds = {
-            'heartRateMin': 60,
-            'heartRateMax': 100,
-            'bpSystolicMax': 140,
-            'bpDiastolicMax': 90,
-            'sleepHoursMin': 6,
-            'activityLevelMin': 30
-        }
-    else:
-        thresholds = json.loads(user_profile.alert_thresholds)
+    t = SimpleNamespace(**get_alert_thresholds(str(user_id)))
+    heart_rate = health_data.heart_rate
+    systolic = health_data.blood_pressure_systolic
+    diastolic = health_data.blood_pressure_diastolic
+    sleep_hours = health_data.sleep_hours
+    activity_level = health_data.activity_level
 
     # Heart rate alerts
-    if health_data.heart_rate:
-        if health_data.heart_rate > thresholds.get('heartRateMax', 100):
+    if heart_rate:
+        heart_rate_range = f'({t.heartRateMin}-{t.heartRateMax} bpm)'
+        if heart_rate > t.heartRateMax:
             alerts_to_create.append({
                 'type': 'warning',
                 'title': 'Elevated Heart Rate',
-                'message': f'Heart rate is {health_data.heart_rate} bpm, above normal range (' + str(thresholds.get('heartRateMin', 60)) + '-' + str(thresholds.get('heartRateMax', 100)) + ' bpm)',
+                'message': f'Heart rate is {heart_rate} bpm, above normal range {heart_rate_range}',
                 'metric': 'heartRate',
-                'value': str(health_data.heart_rate)
+                'value': str(heart_rate)
             })
-        elif health_data.heart_rate < thresholds.get('heartRateMin', 60):
+        elif heart_rate < t.heartRateMin:
             alerts_to_create.append({
                 'type': 'warning',
                 'title': 'Low Heart Rate',
-                'message': f'Heart rate is {health_data.heart_rate} bpm, below normal range (' + str(thresholds.get('heartRateMin', 60)) + '-' + str(thresholds.get('heartRateMax', 100)) + ' bpm)',
+                'message': f'Heart rate is {heart_rate} bpm, below normal range {heart_rate_range}',
                 'metric': 'heartRate',
-                'value': str(health_data.heart_rate)
+                'value': str(heart_rate)
             })
     
     # Blood pressure alerts
-    if health_data.blood_pressure_systolic and health_data.blood_pressure_diastolic:
-        if health_data.blood_pressure_systolic > thresholds.get('bpSystolicMax', 140) or health_data.blood_pressure_diastolic > thresholds.get('bpDiastolicMax', 90):
+    if systolic and diastolic:
+        if systolic > t.bpSystolicMax or diastolic > t.bpDiastolicMax:
             alerts_to_create.append({
                 'type': 'alert',
                 'title': 'High Blood Pressure',
-                'message': f'Blood pressure is {health_data.blood_pressure_systolic}/{health_data.blood_pressure_diastolic}, above target range (' + str(thresholds.get('bpSystolicMax', 140)) + '/' + str(thresholds.get('bpDiastolicMax', 90)) + ') mmHg',
+                'message': f'Blood pressure is {systolic}/{diastolic}, above target range ({t.bpSystolicMax}/{t.bpDiastolicMax}) mmHg',
                 'metric': 'bloodPressure',
-                'value': f'{health_data.blood_pressure_systolic}/{health_data.blood_pressure_diastolic}'
+                'value': f'{systolic}/{diastolic}'
             })
     
     # Sleep alerts
-    if health_data.sleep_hours and health_data.sleep_hours < thresholds.get('sleepHoursMin', 6):
+    if sleep_hours and sleep_hours < t.sleepHoursMin:
             alerts_to_create.append({
                 'type': 'warning',
                 'title': 'Insufficient Sleep',
-                'message': f'Only {health_data.sleep_hours} hours of sleep, below minimum (' + str(thresholds.get('sleepHoursMin', 6)) + ') hours',
+                'message': f'Only {sleep_hours} hours of sleep, below minimum ({t.sleepHoursMin}) hours',
                 'metric': 'sleep',
-                'value': str(health_data.sleep_hours)
+                'value': str(sleep_hours)
             })
 
     # Activity alerts
-    if health_data.activity_level and health_data.activity_level < thresholds.get('activityLevelMin', 30):
+    if activity_level and activity_level < t.activityLevelMin:
             alerts_to_create.append({
                 'type': 'warning',
                 'title': 'Low Activity Level',
-                'message': f'Activity level is {health_data.activity_level}, below minimum (' + str(thresholds.get('activityLevelMin', 30)) + ')',
+                'message': f'Activity level is {activity_level}, below minimum ({t.activityLevelMin})',
                 'metric': 'activity',
-                'value': str(health_data.activity_level)
+                'value': str(activity_level)
             })
     
     # Create alerts
-    for alert_data in alerts_to_create:
-        alert = Alert(
-            user_id=user_id,
-            alert_type=alert_data['type'],
-            title=alert_data['title'],
-            message=alert_data['message'],
-            metric=alert_data['metric'],
-            value=alert_data['value']
-        )
-        db.session.add(alert)
+    insert_alerts(user_id, alerts_to_create)
+
+def insert_alerts(user_id, alerts):
+    """Insert alerts for a user in a single executemany INSERT"""
+    if alerts:
+        db.session.execute(Alert.__table__.insert(), [
+            {
+                'user_id': user_id,
+                'alert_type': alert_data['type'],
+                'title': alert_data['title'],
+                'message': alert_data['message'],
+                'metric': alert_data['metric'],
+                'value': alert_data['value']
+            }
+            for alert_data in alerts
+        ])
 
 def generate_sample_alerts(user_id):
     """Generate some sample alerts for demonstration"""
@@ -362,17 +580,10 @@ def generate_sample_alerts(user_id):
             }
         ]
         
-        for alert_data in sample_alerts:
-            if random.random() < 0.5:  # 50% chance for each alert
-                alert = Alert(
-                    user_id=user_id,
-                    alert_type=alert_data['type'],
-                    title=alert_data['title'],
-                    message=alert_data['message'],
-                    metric=alert_data['metric'],
-                    value=alert_data['value']
-                )
-                db.session.add(alert)
+        insert_alerts(user_id, [
+            alert_data for alert_data in sample_alerts
+            if random.random() < 0.5  # 50% chance for each alert
+        ])
 
 
 
@@ -402,6 +613,7 @@ def create_alert_manual():
         )
         db.session.add(alert)
         db.session.commit()
+        invalidate_user_cache(user_id)
         return jsonify({"message": "Alert created successfully", "alert": alert.to_dict()}), 201
     except Exception as e:
         db.session.rollback()
@@ -436,6 +648,8 @@ def save_question_response():
         alerts_created = analyze_question_response(user_id, question_text, response)
         
         db.session.commit()
+        if alerts_created:
+            invalidate_user_cache(user_id)
         
         return jsonify({
             'message': 'Response saved successfully',
@@ -460,121 +674,97 @@ def get_question_responses():
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
     
-    questions = Question.query.filter(
-        Question.user_id == user_id,
-        Question.asked_at >= start_date
-    ).order_by(Question.asked_at.desc()).all()
+    questions = db.session.execute(
+        select(Question.__table__).where(
+            Question.user_id == user_id,
+            Question.asked_at >= start_date
+        ).order_by(Question.asked_at.desc())
+    ).all()
     
     return jsonify({
-        'questions': [q.to_dict() for q in questions],
+        'questions': Question.bulk_to_dict(questions),
         'count': len(questions)
     })
 
+def _keyword_pattern(keywords):
+    """Compile keywords into one regex that finds every (possibly overlapping) occurrence"""
+    return re.compile('(?=(' + '|'.join(map(re.escape, keywords)) + '))')
+
+# Map of concerning responses
+NEGATIVE_RESPONSES = frozenset(['not great', 'not good', 'poor', 'no', 'not really', 'bad', 'terrible'])
+POSITIVE_PAIN_RESPONSES = frozenset(['yes', 'yeah', 'yep', 'quite a bit', 'a lot', 'severe'])
+NEGATIVE_RESPONSE_PATTERN = _keyword_pattern(NEGATIVE_RESPONSES)
+POSITIVE_PAIN_RESPONSE_PATTERN = _keyword_pattern(POSITIVE_PAIN_RESPONSES)
+
+# Question keywords and the category they belong to, in priority order
+QUESTION_CATEGORIES = (
+    ('wellness', ('feeling', 'how are you')),
+    ('sleep', ('sleep',)),
+    ('pain', ('pain', 'discomfort')),
+    ('medication', ('medication',)),
+    ('energy', ('energy',)),
+    ('hydration', ('hydrat', 'water')),
+    ('activity', ('walk', 'exercise'))
+)
+QUESTION_KEYWORD_CATEGORIES = {
+    keyword: category
+    for category, keywords in QUESTION_CATEGORIES
+    for keyword in keywords
+}
+QUESTION_KEYWORDS = _keyword_pattern(QUESTION_KEYWORD_CATEGORIES)
+
+# Alert raised for a concerning response, by question category
+QUESTION_ALERTS = {
+    'wellness': ('warning', 'Wellness Check Concern', 'Parent reported feeling "{}" when asked about their wellbeing', 'mood'),
+    'sleep': ('warning', 'Sleep Quality Concern', 'Parent reported "{}" when asked about sleep', 'sleep'),
+    'pain': ('alert', 'Pain or Discomfort Reported', 'Parent reported "{}" when asked about pain or discomfort', 'pain'),
+    'medication': ('warning', 'Medication Adherence Concern', 'Parent reported "{}" when asked about medications', 'medication'),
+    'energy': ('warning', 'Low Energy Reported', 'Parent reported "{}" energy level', 'energy'),
+    'hydration': ('info', 'Hydration Reminder Needed', 'Parent reported "{}" when asked about hydration', 'hydration'),
+    'activity': ('info', 'Activity Level Concern', 'Parent reported "{}" when asked about physical activity', 'activity')
+}
+
+def _mentions_any(text, keywords, pattern):
+    """Whether any keyword occurs in text; an answer that is exactly a keyword skips the scan"""
+    return text in keywords or pattern.search(text) is not None
+
 def analyze_question_response(user_id, question_text, response):
     """Analyze question response and create alerts for concerning responses"""
     alerts_created = []
     
-    # Map of concerning responses
-    negative_responses = ['not great', 'not good', 'poor', 'no', 'not really', 'bad', 'terrible']
-    positive_pain_responses = ['yes', 'yeah', 'yep', 'quite a bit', 'a lot', 'severe']
+    # Every category the question mentions, found in a single scan
+    categories = {
+        QUESTION_KEYWORD_CATEGORIES[keyword]
+        for keyword in QUESTION_KEYWORDS.findall(question_text.lower())
+    }
     response_lower = response.lower()
     
     # Check if response is concerning
     # For pain questions, "yes" is concerning; for other questions, negative words are concerning
-    is_pain_question = 'pain' in question_text.lower() or 'discomfort' in question_text.lower()
-    
-    if is_pain_question:
-        is_concerning = any(pos in response_lower for pos in positive_pain_responses)
+    if 'pain' in categories:
+        is_concerning = _mentions_any(response_lower, POSITIVE_PAIN_RESPONSES, POSITIVE_PAIN_RESPONSE_PATTERN)
     else:
-        is_concerning = any(neg in response_lower for neg in negative_responses)
+        is_concerning = _mentions_any(response_lower, NEGATIVE_RESPONSES, NEGATIVE_RESPONSE_PATTERN)
     
     if not is_concerning:
         return alerts_created
     
-    # Create alerts based on question type
-    if 'feeling' in question_text.lower() or 'how are you' in question_text.lower():
-        alert = Alert(
-            user_id=user_id,
-            alert_type='warning',
-            title='Wellness Check Concern',
-            message=f'Parent reported feeling "{response}" when asked about their wellbeing',
-            metric='mood',
-            value=response
-        )
-        db.session.add(alert)
-        alerts_created.append('wellness')
-        
-    elif 'sleep' in question_text.lower():
-        alert = Alert(
-            user_id=user_id,
-            alert_type='warning',
-            title='Sleep Quality Concern',
-            message=f'Parent reported "{response}" when asked about sleep',
-            metric='sleep',
-            value=response
-        )
-        db.session.add(alert)
-        alerts_created.append('sleep')
-        
-    elif 'pain' in question_text.lower() or 'discomfort' in question_text.lower():
-        alert = Alert(
-            user_id=user_id,
-            alert_type='alert',
-            title='Pain or Discomfort Reported',
-            message=f'Parent reported "{response}" when asked about pain or discomfort',
-            metric='pain',
-            value=response
-        )
-        db.session.add(alert)
-        alerts_created.append('pain')
-        
-    elif 'medication' in question_text.lower():
-        alert = Alert(
-            user_id=user_id,
-            alert_type='warning',
-            title='Medication Adherence Concern',
-            message=f'Parent reported "{response}" when asked about medications',
-            metric='medication',
-            value=response
-        )
-        db.session.add(alert)
-        alerts_created.append('medication')
-        
-    elif 'energy' in question_text.lower():
-        alert = Alert(
-            user_id=user_id,
-            alert_type='warning',
-            title='Low Energy Reported',
-            message=f'Parent reported "{response}" energy level',
-            metric='energy',
-            value=response
-        )
-        db.session.add(alert)
-        alerts_created.append('energy')
-        
-    elif 'hydrat' in question_text.lower() or 'water' in question_text.lower():
-        alert = Alert(
-            user_id=user_id,
-            alert_type='info',
-            title='Hydration Reminder Needed',
-            message=f'Parent reported "{response}" when asked about hydration',
-            metric='hydration',
-            value=response
-        )
-        db.session.add(alert)
-        alerts_created.append('hydration')
-        
-    elif 'walk' in question_text.lower() or 'exercise' in question_text.lower():
-        alert = Alert(
-            user_id=user_id,
-            alert_type='info',
-            title='Activity Level Concern',
-            message=f'Parent reported "{response}" when asked about physical activity',
-            metric='activity',
-            value=response
-        )
-        db.session.add(alert)
-        alerts_created.append('activity')
+    # Create an alert for the highest priority category the question matched
+    category = next((category for category, _ in QUESTION_CATEGORIES if category in categories), None)
+    if category is None:
+        return alerts_created
+    
+    alert_type, title, message, metric = QUESTION_ALERTS[category]
+    alert = Alert(
+        user_id=user_id,
+        alert_type=alert_type,
+        title=title,
+        message=message.format(response),
+        metric=metric,
+        value=response
+    )
+    db.session.add(alert)
+    alerts_created.append(category)
     
     return alerts_created
 
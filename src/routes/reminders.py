@@ -23,23 +23,25 @@ def get_reminders():
             reminders = Reminder.get_daily_reminders(user_id)
         elif reminder_type == 'event' and status == 'active':
             # Get only active event reminders (not daily)
-            reminders = Reminder.query.filter_by(
-                user_id=user_id,
-                reminder_type='event',
-                status='active'
-            ).order_by(Reminder.created_at.desc()).all()
+            reminders = Reminder.fetch_rows(
+                Reminder.user_id == user_id,
+                Reminder.reminder_type == 'event',
+                Reminder.status == 'active',
+                order_by=(Reminder.created_at.desc(),)
+            )
         elif status == 'active':
             reminders = Reminder.get_active_reminders(user_id)
         elif status == 'completed':
             reminders = Reminder.get_completed_reminders(user_id)
         else:
             # Get all reminders
-            reminders = Reminder.query.filter_by(user_id=user_id).order_by(
-                Reminder.created_at.desc()
-            ).all()
+            reminders = Reminder.fetch_rows(
+                Reminder.user_id == user_id,
+                order_by=(Reminder.created_at.desc(),)
+            )
         
         return jsonify({
-            'reminders': [reminder.to_dict() for reminder in reminders]
+            'reminders': Reminder.bulk_to_dict(reminders)
         })
     
     except Exception as e:
@@ -178,16 +180,10 @@ def seed_reminders():
             }
         ]
         
-        for reminder_data in sample_reminders:
-            reminder = Reminder(
-                user_id=user_id,
-                title=reminder_data['title'],
-                description=reminder_data['description'],
-                priority=reminder_data['priority'],
-                created_by='1'  # Caregiver user ID
-            )
-            db.session.add(reminder)
-        
+        db.session.execute(Reminder.__table__.insert(), [
+            dict(reminder_data, user_id=user_id, created_by='1')  # Caregiver user ID
+            for reminder_data in sample_reminders
+        ])
         db.session.commit()
         
         return jsonify({'message': f'Created {len(sample_reminders)} sample reminders'})
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from src.models.health_data import db, UserProfile
-import json
+from src.cache import cache
+from src.routes.health import load_alert_thresholds
 
 user_profile_bp = Blueprint("user_profile", __name__)
 
@@ -26,10 +27,12 @@ def update_user_profile(user_id):
     if "monitored_user_id" in data:
         user_profile.monitored_user_id = data["monitored_user_id"]
     if "alert_thresholds" in data:
-        user_profile.alert_thresholds = json.dumps(data["alert_thresholds"])
+        user_profile.alert_thresholds = data["alert_thresholds"]
 
     try:
         db.session.commit()
+        if "alert_thresholds" in data:
+            cache.delete_memoized(load_alert_thresholds, user_id)
         return jsonify(user_profile.to_dict())
     except Exception as e:
         db.session.rollback()